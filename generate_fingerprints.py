@@ -20,22 +20,45 @@ Or use command line arguments:
 import os
 import sys
 import argparse
+import json
+import multiprocessing
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the pytorch-CycleGAN-and-pix2pix directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'pytorch-CycleGAN-and-pix2pix'))
 
 from options.test_options import TestOptions
-from data import create_dataset
+from data.single_dataset import SingleDataset
+from data.image_folder import make_dataset
 from models import create_model
-from util.util import tensor2im
+import numpy as np
 import torch
-import matplotlib.pyplot as plt
+from PIL import Image
+
+# inference_mode (PyTorch 1.9+) also skips autograd version counting and view
+# tracking; fall back to no_grad on older releases
+inference_mode = getattr(torch, 'inference_mode', torch.no_grad)
+
+# DataLoader workers used when num_workers is not given, on platforms that fork them
+DEFAULT_NUM_WORKERS = 4
+
+# Generated batches that may be queued for saving before the next forward pass waits
+MAX_PENDING_SAVE_BATCHES = 2
+
+# Generator precisions selectable on GPU; CPU inference always runs in float32
+PRECISIONS = {
+    'fp32': torch.float32,
+    'fp16': torch.float16,
+    'bf16': torch.bfloat16,
+}
 
 class SimpleOptions:
     """Simplified options class with predefined settings for fingerprint generation."""
     
-    def __init__(self, input_dir, model_path):
+    def __init__(self, input_dir, model_path, batch_size=32, num_threads=4):
         # Required paths
         self.dataroot = input_dir
         self.checkpoints_dir = os.path.dirname(model_path)
@@ -60,8 +83,8 @@ class SimpleOptions:
         # Training-related (not used in test)
         self.isTrain = False
         self.serial_batches = True
-        self.num_threads = 0
-        self.batch_size = 1
+        self.num_threads = num_threads
+        self.batch_size = batch_size
         self.no_flip = True
         
         # Additional required attributes
@@ -75,85 +98,474 @@ class SimpleOptions:
         self.preprocess = 'none'
         self.eval = False
         
-        # Ensure model file exists with correct name
+        # Ensure model file exists with correct name; links and copy2 both keep
+        # the source modification time, so this only runs when the model changes
         expected_model_file = os.path.join(self.checkpoints_dir, f'{self.epoch}_net_G.pth')
-        if not os.path.exists(expected_model_file):
-            # Copy/rename the model file to expected location
+        if os.path.exists(model_path) and (
+                not os.path.exists(expected_model_file) or
+                os.path.getmtime(expected_model_file) < os.path.getmtime(model_path)):
+            # Link/rename the model file to expected location
             os.makedirs(self.checkpoints_dir, exist_ok=True)
-            if os.path.exists(model_path):
-                import shutil
-                shutil.copy2(model_path, expected_model_file)
-                print(f"Copied model from {model_path} to {expected_model_file}")
+            action = _link_or_copy(model_path, expected_model_file)
+            print(f"{action} model from {model_path} to {expected_model_file}")
 
-def generate_fingerprints(input_dir, output_dir=None, model_path="weights/pix2pix_model.pt"):
+def _link_or_copy(src, dst):
     """
-    Generate fingerprint images from template images.
+    Make src available at dst, preferring a symlink or hard link over a copy.
     
-    Args:
-        input_dir: Directory containing template images
-        output_dir: Directory to save generated fingerprints (optional)
-        model_path: Path to the trained model file
+    Returns:
+        'Linked' or 'Copied', describing what was done
     """
+    if os.path.lexists(dst):
+        os.remove(dst)
     
-    # Validate inputs
-    if not os.path.exists(input_dir):
-        raise FileNotFoundError(f"Input directory not found: {input_dir}")
+    try:
+        os.symlink(os.path.abspath(src), dst)
+        return 'Linked'
+    except OSError:
+        pass
+    
+    try:
+        os.link(src, dst)
+        return 'Linked'
+    except OSError:
+        shutil.copy2(src, dst)
+        return 'Copied'
+
+def _default_num_workers():
+    """
+    Number of DataLoader workers to use when the caller did not choose one.
+    
+    Where workers are spawned rather than forked (Windows, macOS), each one
+    re-imports the caller's __main__ module, which fails for scripts that run
+    the generator outside an `if __name__ == "__main__":` guard. Images are
+    then loaded in the main process instead.
+    """
+    method = multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_all_start_methods()[0]
+    return DEFAULT_NUM_WORKERS if method == 'fork' else 0
+
+def _to_uint8_images(fake):
+    """
+    Convert a batch of generator outputs in [-1, 1] to uint8 arrays.
+    
+    Single-channel outputs are returned as (N, H, W) grayscale arrays,
+    multi-channel outputs as (N, H, W, C).
+    """
+    # Scale on the device so the batch needs a single device-to-host copy
+    images = ((fake.float().clamp(-1, 1) + 1) * 127.5).to(torch.uint8)
+    if images.shape[1] == 1:
+        images = images[:, 0]
+    else:
+        images = images.permute(0, 2, 3, 1)
+    return images.contiguous().cpu().numpy()
+
+def _normalize(batch, dtype):
+    """Map a uint8 image batch to [-1, 1] in the given dtype, matching the dataset transform."""
+    # Computed in float32 and cast once, so reduced precisions are rounded only once
+    return batch.float().div_(127.5).sub_(1).to(dtype)
+
+def _save_png(output_path, image):
+    """Write an 8-bit generated fingerprint as a PNG with fast compression."""
+    mode = 'L' if image.ndim == 2 else 'RGB'
+    Image.fromarray(image, mode=mode).save(output_path, format='PNG', compress_level=1)
+
+def _make_power_of_4(img):
+    """
+    Round the image size to a multiple of 4 with a bicubic resize, as the
+    pix2pix transform does for preprocess='none'.
     
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(f"Model file not found: {model_path}")
+    A module-level function rather than get_transform's lambda, so datasets
+    using it can be pickled into spawn-started DataLoader workers.
+    """
+    ow, oh = img.size
+    w = int(round(ow / 4) * 4)
+    h = int(round(oh / 4) * 4)
+    if (w, h) == (ow, oh):
+        return img
+    return img.resize((w, h), Image.BICUBIC)
+
+class TemplateDataset(SingleDataset):
+    """
+    SingleDataset variant that returns raw uint8 CHW tensors.
     
-    # Set default output directory
-    if output_dir is None:
-        output_dir = os.path.join(os.path.dirname(input_dir), 'generated_fingerprints')
+    Normalization to [-1, 1] is left to the caller so that it can run on the
+    device after the (4x smaller than float32) host-to-device copy.
+    """
     
-    os.makedirs(output_dir, exist_ok=True)
+    def __init__(self, opt):
+        SingleDataset.__init__(self, opt)
+        input_nc = self.opt.output_nc if self.opt.direction == 'BtoA' else self.opt.input_nc
+        # The steps of get_transform(opt, convert=False) for SimpleOptions
+        # (preprocess='none', no_flip), without its unpicklable lambdas
+        self.grayscale = input_nc == 1
+        self.transform = _make_power_of_4
     
-    print(f"Input directory: {input_dir}")
-    print(f"Output directory: {output_dir}")
-    print(f"Model path: {model_path}")
+    def __getitem__(self, index):
+        A_path = self.A_paths[index]
+        A_img = Image.open(A_path).convert('RGB')
+        if self.grayscale:
+            A_img = A_img.convert('L')
+        A_img = self.transform(A_img)
+        A = torch.from_numpy(np.array(A_img, dtype=np.uint8))
+        A = A[None] if A.ndim == 2 else A.permute(2, 0, 1).contiguous()
+        return {'A': A, 'A_paths': A_path}
+
+# Bumped whenever the cache layout or decoding changes, so older caches are rebuilt
+CACHE_VERSION = 2
+
+class CachedTemplateDataset(torch.utils.data.Dataset):
+    """
+    Template images pre-decoded into a memory-mapped uint8 array.
     
-    # Create options
-    opt = SimpleOptions(input_dir, model_path)
+    On first use every image in opt.dataroot is decoded once, with the same
+    conversion and multiple-of-4 size rounding as TemplateDataset, and stored
+    in cache_path with shape (N, input_nc, H, W). All templates must share one
+    size. A JSON index next to it records the source paths, modification times
+    and frame shape; the cache is rebuilt whenever the images change. Later
+    runs read frames straight from the page cache.
     
-    # Create dataset and model
-    dataset = create_dataset(opt)
-    model = create_model(opt)
-    model.setup(opt)
+    Items are fetched by lists of indices (see create_dataloader), so a batch
+    of consecutive frames is a single slice of the memory map. Frames are
+    returned as raw uint8 and must be normalized to [-1, 1] by the caller.
+    """
     
-    # Set model to evaluation mode
-    model.eval()
+    def __init__(self, opt, cache_path):
+        self.A_paths = sorted(make_dataset(opt.dataroot, opt.max_dataset_size))
+        self.channels = opt.input_nc
+        self.cache_path = cache_path
+        self.index_path = f"{cache_path}.json"
+        self._frames = None
+        
+        index = {
+            'version': CACHE_VERSION,
+            'paths': self.A_paths,
+            'mtimes': [os.path.getmtime(path) for path in self.A_paths],
+        }
+        self.shape = self._current_shape(index)
+        if self.shape is None:
+            self.shape = self._build(index)
     
-    print(f"Processing {len(dataset)} images...")
+    def __getstate__(self):
+        # Workers reopen the memory map instead of receiving a pickled copy of it
+        state = self.__dict__.copy()
+        state['_frames'] = None
+        return state
     
-    # Process images
-    for i, data in enumerate(dataset):
-        if i >= opt.num_test:
-            break
-            
-        model.set_input(data)
-        model.test()
-        visuals = model.get_current_visuals()
-        img_path = model.get_image_paths()
-        
-        if i % 50 == 0:
-            print(f'Processing image {i+1}/{len(dataset)}: {img_path[0]}')
-        
-        # Save generated image
-        if 'fake' in visuals:
-            # Get the generated image
-            fake_img = tensor2im(visuals['fake'])
-            
-            # Create output filename
-            input_filename = os.path.basename(img_path[0])
-            name_without_ext = os.path.splitext(input_filename)[0]
-            output_filename = f"{name_without_ext}_generated.png"
-            output_path = os.path.join(output_dir, output_filename)
+    @property
+    def frames(self):
+        if self._frames is None:
+            if self.A_paths:
+                self._frames = np.memmap(self.cache_path, dtype=np.uint8, mode='r', shape=self.shape)
+            else:
+                self._frames = np.empty(self.shape, dtype=np.uint8)
+        return self._frames
+    
+    def _current_shape(self, index):
+        """Return the frame shape of the cache on disk, or None if it is stale."""
+        if not (os.path.exists(self.cache_path) and os.path.exists(self.index_path)):
+            return None
+        try:
+            with open(self.index_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            # Unreadable, truncated or corrupt index; rebuild
+            return None
+        if not isinstance(cached, dict):
+            return None
+        shape = tuple(cached.pop('shape', ()))
+        if cached != index or len(shape) != 4 or shape[1] != self.channels:
+            return None
+        if os.path.getsize(self.cache_path) != int(np.prod(shape)):
+            return None
+        return shape
+    
+    def _load_frame(self, path):
+        """Decode one template exactly as TemplateDataset does, as a CHW array."""
+        with Image.open(path) as img:
+            img = img.convert('RGB')
+            if self.channels == 1:
+                img = img.convert('L')
+            frame = np.asarray(_make_power_of_4(img))
+        return frame.transpose(2, 0, 1) if frame.ndim == 3 else frame[None]
+    
+    def _build(self, index):
+        """Decode all images into the memory-mapped cache file and return its shape."""
+        print(f"Building template cache {self.cache_path} for {len(self.A_paths)} images...")
+        
+        # Invalidate the old index first; it is rewritten once the frames are complete
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        
+        if self.A_paths:
+            first = self._load_frame(self.A_paths[0])
+            shape = (len(self.A_paths),) + first.shape
+            frames = np.memmap(self.cache_path, dtype=np.uint8, mode='w+', shape=shape)
+            frames[0] = first
+            for i, path in enumerate(self.A_paths[1:], start=1):
+                frame = self._load_frame(path)
+                if frame.shape != first.shape:
+                    del frames
+                    raise ValueError(
+                        f"Cannot cache templates of different sizes: {path} is "
+                        f"{frame.shape[2]}x{frame.shape[1]}, {self.A_paths[0]} is "
+                        f"{first.shape[2]}x{first.shape[1]}; run without a cache instead")
+                frames[i] = frame
+            frames.flush()
+            del frames
+        else:
+            shape = (0, self.channels, 0, 0)
+            open(self.cache_path, 'wb').close()
+        
+        # Written last so that an interrupted build is never treated as valid
+        with open(self.index_path, 'w') as f:
+            json.dump(dict(index, shape=list(shape)), f)
+        return shape
+    
+    def __getitem__(self, indices):
+        """Return the frames and paths for a list of consecutive indices."""
+        start, stop = indices[0], indices[-1] + 1
+        return {
+            'A': torch.from_numpy(np.array(self.frames[start:stop])),
+            'A_paths': self.A_paths[start:stop],
+        }
+    
+    def __len__(self):
+        """Return the total number of images in the dataset."""
+        return len(self.A_paths)
+
+def create_dataloader(opt, cache_path=None):
+    """
+    Create a DataLoader over the template images in opt.dataroot.
+    
+    Image decoding runs in opt.num_threads worker processes, and batches are
+    placed in pinned memory when a GPU is used so that the host-to-device copy
+    can run asynchronously. If cache_path is given, the images are served from
+    a CachedTemplateDataset at that location instead. Either way batches hold
+    raw uint8 frames; see _normalize.
+    """
+    num_workers = int(opt.num_threads)
+    loader_args = dict(
+        num_workers=num_workers,
+        pin_memory=len(opt.gpu_ids) > 0,
+        persistent_workers=num_workers > 0)
+    
+    if cache_path is not None:
+        # Hand whole index batches to the dataset so each batch is one slice
+        dataset = CachedTemplateDataset(opt, cache_path)
+        sampler = torch.utils.data.BatchSampler(
+            torch.utils.data.SequentialSampler(dataset), opt.batch_size, drop_last=False)
+        return torch.utils.data.DataLoader(dataset, batch_size=None, sampler=sampler, **loader_args)
+    
+    dataset = TemplateDataset(opt)
+    return torch.utils.data.DataLoader(
+        dataset,
+        batch_size=opt.batch_size,
+        shuffle=False,
+        **loader_args)
+
+class FingerprintGenerator:
+    """
+    Pix2Pix fingerprint generator that loads the model once and can then be
+    applied to any number of template directories.
+    
+    Example:
+        generator = FingerprintGenerator("weights/pix2pix_model.pt")
+        generator("templates_a/", "generated_a/")
+        generator("templates_b/", "generated_b/")
+    """
+    
+    def __init__(self, model_path="weights/pix2pix_model.pt", batch_size=32, num_workers=None,
+                 save_workers=4, precision='fp16', compile_model=False):
+        """
+        Load the generator and prepare it for inference.
+        
+        Args:
+            model_path: Path to the trained model file
+            batch_size: Number of templates passed through the generator at once
+            num_workers: Number of DataLoader worker processes for image loading
+                         (None = DEFAULT_NUM_WORKERS where workers are forked,
+                         0 where they are spawned; see _default_num_workers)
+            save_workers: Number of threads encoding and writing PNG files
+            precision: Generator precision on GPU ('fp32', 'fp16' or 'bf16')
+            compile_model: Whether to compile the generator with torch.compile
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision '{precision}', expected one of: {', '.join(PRECISIONS)}")
+        
+        if compile_model and not hasattr(torch, 'compile'):
+            raise RuntimeError("compile_model requires PyTorch 2.0 or newer")
+        
+        print(f"Model path: {model_path}")
+        
+        self.save_workers = save_workers
+        
+        if num_workers is None:
+            num_workers = _default_num_workers()
+        
+        # Create options; dataroot is filled in per call
+        self.opt = opt = SimpleOptions(None, model_path, batch_size, num_workers)
+        
+        # Create model
+        model = create_model(opt)
+        model.setup(opt)
+        
+        # Set model to evaluation mode
+        model.eval()
+        
+        # Cast the generator to the requested inference precision; on GPU the
+        # convolutions also run in channels_last (NHWC), the native Tensor Core layout
+        on_gpu = model.device.type == 'cuda'
+        self.device = model.device
+        self.dtype = PRECISIONS[precision] if on_gpu else torch.float32
+        self.memory_format = torch.channels_last if on_gpu else torch.contiguous_format
+        model.netG.to(dtype=self.dtype, memory_format=self.memory_format)
+        
+        # Call the bare network rather than going through TestModel. With a single
+        # device there is nothing for DataParallel to scatter, so its per-call
+        # scatter/gather is skipped as well (it would also break torch.compile).
+        generator = model.netG
+        if isinstance(generator, torch.nn.DataParallel) and len(opt.gpu_ids) <= 1:
+            generator = generator.module
+        
+        # Compilation happens on the first batch, whose shape follows the
+        # templates' native size (preprocess='none'), so no shape is guessed here
+        if compile_model:
+            mode = 'reduce-overhead' if on_gpu else 'default'
+            generator = torch.compile(generator, mode=mode, fullgraph=True)
+        
+        self.model = model
+        self.generator = generator
+        self.compile_model = compile_model
+        self._compiled_sizes = set()
+    
+    def __call__(self, input_dir, output_dir=None, cache_path=None):
+        """
+        Generate fingerprint images from template images.
+        
+        Args:
+            input_dir: Directory containing template images
+            output_dir: Directory to save generated fingerprints (optional)
+            cache_path: File for a pre-decoded uint8 copy of the templates,
+                        reused across runs over the same directory (optional)
+        """
+        opt = self.opt
+        
+        # Validate inputs
+        if not os.path.exists(input_dir):
+            raise FileNotFoundError(f"Input directory not found: {input_dir}")
+        
+        # Set default output directory
+        if output_dir is None:
+            output_dir = os.path.join(os.path.dirname(input_dir), 'generated_fingerprints')
+        
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        
+        print(f"Input directory: {input_dir}")
+        print(f"Output directory: {output_dir}")
+        
+        # Create dataset
+        opt.dataroot = input_dir
+        dataloader = create_dataloader(opt, cache_path)
+        dataset = dataloader.dataset
+        
+        print(f"Processing {len(dataset)} images in batches of {opt.batch_size}...")
+        
+        # Process images a batch at a time; the generator is called directly since
+        # set_input/test/get_current_visuals only handle a single image and rebuild
+        # the visuals dict on every call. PNG encoding runs on a thread pool so that
+        # it overlaps with the next forward pass. At most MAX_PENDING_SAVE_BATCHES
+        # batches are waiting to be written, so decoded outputs cannot pile up in
+        # memory when the disk is slower than the GPU.
+        processed = 0
+        pending_saves = deque()
+        with ThreadPoolExecutor(max_workers=self.save_workers) as executor, inference_mode():
+            for i, data in enumerate(dataloader):
+                if processed >= opt.num_test:
+                    break
+                
+                real = data['A'].to(self.device, non_blocking=True)
+                img_paths = data['A_paths']
+                if self.compile_model:
+                    real = self._pad_for_compiled(real)
+                real = _normalize(real, self.dtype).contiguous(memory_format=self.memory_format)
+                fake_imgs = _to_uint8_images(self.generator(real))[:len(img_paths)]
+                
+                print(f'Processing batch {i+1}/{len(dataloader)}: {img_paths[0]}')
+                
+                # Wait for the oldest batches; result() also surfaces write errors
+                while len(pending_saves) >= MAX_PENDING_SAVE_BATCHES:
+                    for future in pending_saves.popleft():
+                        future.result()
+                
+                # Save the images
+                pending_saves.append([
+                    executor.submit(_save_png, out_dir / f"{Path(img_path).stem}_generated.png", fake_img)
+                    for img_path, fake_img in zip(img_paths, fake_imgs)
+                ])
+                
+                processed += len(img_paths)
             
-            # Save the image
-            plt.imsave(output_path, fake_img, cmap='gray')
+            # Surface any write errors of the remaining saves
+            while pending_saves:
+                for future in pending_saves.popleft():
+                    future.result()
+        
+        print(f"\nProcessing complete!")
+        print(f"Generated images saved to: {output_dir}")
+    
+    def _pad_for_compiled(self, batch):
+        """
+        Pad a short final batch with blank frames up to the batch size.
+        
+        The compiled generator (and its CUDA graphs under 'reduce-overhead') is
+        specialized to one input shape; padding keeps the last batch on that
+        shape instead of triggering another compilation. Padded outputs are
+        dropped by the caller.
+        """
+        missing = self.opt.batch_size - batch.shape[0]
+        if missing > 0:
+            batch = torch.cat([batch, batch.new_zeros((missing,) + batch.shape[1:])])
+        
+        size = tuple(batch.shape[2:])
+        if size not in self._compiled_sizes:
+            self._compiled_sizes.add(size)
+            print(f"Compiling generator for {size[1]}x{size[0]} templates...")
+        return batch
+
+def generate_fingerprints(input_dir, output_dir=None, model_path="weights/pix2pix_model.pt", batch_size=32,
+                          num_workers=None, save_workers=4, precision='fp16',
+                          compile_model=False, cache_path=None):
+    """
+    Generate fingerprint images from template images.
+    
+    Convenience wrapper that loads the model and processes a single directory.
+    Use FingerprintGenerator directly to process several directories with one
+    model load.
+    
+    Args:
+        input_dir: Directory containing template images
+        output_dir: Directory to save generated fingerprints (optional)
+        model_path: Path to the trained model file
+        batch_size: Number of templates passed through the generator at once
+        num_workers: Number of DataLoader worker processes for image loading
+                     (None = platform default, see FingerprintGenerator)
+        save_workers: Number of threads encoding and writing PNG files
+        precision: Generator precision on GPU ('fp32', 'fp16' or 'bf16')
+        compile_model: Whether to compile the generator with torch.compile
+        cache_path: File for a pre-decoded uint8 copy of the templates (optional)
+    """
+    
+    # Validate inputs before paying for the model load
+    if not os.path.exists(input_dir):
+        raise FileNotFoundError(f"Input directory not found: {input_dir}")
     
-    print(f"\nProcessing complete!")
-    print(f"Generated images saved to: {output_dir}")
+    generator = FingerprintGenerator(model_path, batch_size, num_workers, save_workers,
+                                     precision, compile_model)
+    generator(input_dir, output_dir, cache_path)
 
 # =============================================================================
 # CONFIGURATION - Edit these paths as needed
@@ -161,6 +573,10 @@ def generate_fingerprints(input_dir, output_dir=None, model_path="weights/pix2pi
 INPUT_DIR = "/path/to/your/template/images"      # Directory containing template images
 OUTPUT_DIR = "/path/to/your/output/directory"    # Directory to save generated fingerprints  
 MODEL_PATH = "weights/pix2pix_model.pt"          # Path to your trained model file
+BATCH_SIZE = 32                                  # Templates per generator forward pass
+NUM_WORKERS = 4                                  # DataLoader worker processes (safe on all
+                                                 # platforms: main() runs under the __main__ guard)
+PRECISION = "fp16"                               # Generator precision on GPU: fp32, fp16 or bf16
 # =============================================================================
 
 def main():
@@ -169,6 +585,16 @@ def main():
     parser.add_argument('--output_dir', '-o', type=str, default=OUTPUT_DIR, help='Directory to save generated fingerprints')
     parser.add_argument('--model_path', '-m', type=str, default=MODEL_PATH, 
                        help='Path to trained model file')
+    parser.add_argument('--batch_size', '-b', type=int, default=BATCH_SIZE,
+                       help='Number of templates processed per forward pass')
+    parser.add_argument('--num_workers', '-w', type=int, default=NUM_WORKERS,
+                       help='Number of worker processes used to load images')
+    parser.add_argument('--precision', '-p', type=str, default=PRECISION, choices=list(PRECISIONS),
+                       help='Generator precision when running on GPU')
+    parser.add_argument('--compile', action='store_true',
+                       help='Compile the generator with torch.compile (PyTorch 2.0+)')
+    parser.add_argument('--cache', type=str, default=None,
+                       help='Cache file for pre-decoded templates, reused across runs on the same input')
     
     args = parser.parse_args()
     
@@ -177,12 +603,18 @@ def main():
     # If output_dir is still the placeholder, use None to trigger auto-generation
     output_dir = None if args.output_dir == "/path/to/your/output/directory" else args.output_dir
     model_path = args.model_path
+    batch_size = args.batch_size
+    num_workers = args.num_workers
+    precision = args.precision
+    compile_model = args.compile
+    cache_path = args.cache
     
     print(f"Using input directory: {input_dir}")
     print(f"Using model: {model_path}")
     
     try:
-        generate_fingerprints(input_dir, output_dir, model_path)
+        generate_fingerprints(input_dir, output_dir, model_path, batch_size, num_workers,
+                              precision=precision, compile_model=compile_model, cache_path=cache_path)
     except Exception as e:
         print(f"Error: {e}")
         return 1
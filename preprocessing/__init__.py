@@ -40,8 +40,8 @@ from .template_rendering import (
     visualize_template
 )
 
-import os
 import logging
+from pathlib import Path
 from typing import Optional
 
 __version__ = "1.0.0"
@@ -90,10 +90,11 @@ class PreprocessingPipeline:
         logger.info(f"Starting full preprocessing pipeline: {input_dir} -> {output_dir}")
         
         # Create output directories
-        processed_dir = os.path.join(output_dir, "processed")
-        minutiae_dir = os.path.join(output_dir, "minutiae") 
-        txt_dir = os.path.join(output_dir, "minutiae_txt")
-        templates_dir = os.path.join(output_dir, "templates")
+        base = Path(output_dir)
+        processed_dir = str(base / "processed")
+        minutiae_dir = str(base / "minutiae")
+        txt_dir = str(base / "minutiae_txt")
+        templates_dir = str(base / "templates")
         
         stats = {}
         
@@ -124,7 +125,7 @@ class PreprocessingPipeline:
         # Step 3: Convert minutiae to text format
         logger.info("Step 3: Converting minutiae to text format...")
         txt_count, _ = convert_all_minutiae_files(
-            minutiae_dir, txt_dir, min_minutiae_count=5
+            minutiae_dir, txt_dir, min_minutiae_count=5, config=self.config
         )
         stats['minutiae_conversion'] = {
             'converted': txt_count,
@@ -207,8 +208,9 @@ class PreprocessingPipeline:
         logger.info("Running minutiae extraction only...")
         
         # Extract minutiae
-        minutiae_dir = os.path.join(output_dir, "minutiae")
-        txt_dir = os.path.join(output_dir, "minutiae_txt")
+        base = Path(output_dir)
+        minutiae_dir = str(base / "minutiae")
+        txt_dir = str(base / "minutiae_txt")
         
         extracted_count, total_images = extract_minutiae_from_folder(
             input_dir, minutiae_dir, config=self.config
@@ -216,7 +218,7 @@ class PreprocessingPipeline:
         
         # Convert to text format
         converted_count, _ = convert_all_minutiae_files(
-            minutiae_dir, txt_dir, min_minutiae_count=5
+            minutiae_dir, txt_dir, min_minutiae_count=5, config=self.config
         )
         
         return {
@@ -24,6 +24,15 @@ class Config:
     MINUTIAE_GAIN = 60  # Gain factor for minutiae visualization
     ORIENTATION_GAIN = 3  # Gain factor for orientation lines
     
+    # Parallelism for folder-level processing (None = use all CPU cores, 1 = serial).
+    # On platforms that spawn worker processes (Windows, macOS) None stays serial for
+    # process-based steps; an explicit count there needs the calling script's
+    # pipeline code under `if __name__ == "__main__":`.
+    NUM_WORKERS = None
+    
+    # Format of converted minutiae files ('txt' = text, 'npy' = binary float32, faster to load)
+    MINUTIAE_FILE_FORMAT = 'txt'
+    
     # File extensions
     SUPPORTED_IMAGE_FORMATS = ['.bmp', '.jpg', '.jpeg', '.png', '.tif', '.tiff']
     
@@ -32,5 +41,11 @@ class Config:
     BRIGHTNESS_THRESHOLD = 225  # Threshold for determining if cropping is needed
 
 def get_default_config():
-    """Get default configuration instance."""
+    """
+    Get default configuration instance.
+    
+    A new instance is returned on every call, so callers may modify it freely.
+    This is cheap: Config only holds class attributes. Folder-level functions
+    resolve the configuration once and pass it to their per-file workers.
+    """
     return Config()
\ No newline at end of file
@@ -126,6 +126,8 @@ from preprocessing import Config
 
 config = Config()
 config.NFIQ_THRESHOLD = 2  # More lenient filtering
+config.NUM_WORKERS = 4     # Worker processes; on Windows/macOS run from under
+                           # `if __name__ == "__main__":`
 pipeline = PreprocessingPipeline(config)
 
 # 3. Individual steps
@@ -6,7 +6,6 @@ import os
 import cv2
 import numpy as np
 import logging
-from tqdm import tqdm
 from typing import Optional, Tuple
 
 try:
@@ -16,7 +15,7 @@ except ImportError:
     ENHANCER_AVAILABLE = False
     logging.warning("fingerprint_enhancer not available. Enhancement will be skipped.")
 
-from .utils import compute_nfiq_score, convert_image_to_png
+from .utils import compute_nfiq_score, convert_image_to_png, run_parallel
 from .config import get_default_config
 
 logger = logging.getLogger(__name__)
@@ -247,7 +246,8 @@ def process_folder(
     filter_nfiq_score: bool = True,
     crop_center: bool = True,
     enhance: bool = False,
-    config=None
+    config=None,
+    num_workers: Optional[int] = None
 ) -> Tuple[int, int]:
     """
     Process all fingerprint images in a folder.
@@ -259,6 +259,7 @@ def process_folder(
         crop_center: Whether to apply cropping and centering
         enhance: Whether to apply fingerprint enhancement
         config: Configuration object (optional)
+        num_workers: Number of worker processes (optional, defaults to config.NUM_WORKERS)
     
     Returns:
         Tuple of (successful_count, total_count)
@@ -266,21 +267,31 @@ def process_folder(
     if config is None:
         config = get_default_config()
     
-    os.makedirs(output_dir, exist_ok=True)
+    if num_workers is None:
+        num_workers = config.NUM_WORKERS
     
-    successful = 0
-    total = 0
+    os.makedirs(output_dir, exist_ok=True)
     
     files = [f for f in os.listdir(input_dir) 
              if any(f.lower().endswith(ext) for ext in config.SUPPORTED_IMAGE_FORMATS)]
     
-    for img_name in tqdm(files, desc="Processing fingerprints"):
-        total += 1
+    tasks = []
+    output_sources = {}
+    for img_name in files:
+        output_name = os.path.splitext(img_name)[0] + '.png'
+        # a.jpg and a.png would write (and race on) the same output file
+        if output_name in output_sources:
+            logger.error(f"Skipping {img_name}: output {output_name} already comes from "
+                         f"{output_sources[output_name]}")
+            continue
+        output_sources[output_name] = img_name
         img_path = os.path.join(input_dir, img_name)
-        output_path = os.path.join(output_dir, os.path.splitext(img_name)[0] + '.png')
-        
-        if preprocess_fingerprint_scan(img_path, output_path, filter_nfiq_score, crop_center, enhance, config):
-            successful += 1
+        output_path = os.path.join(output_dir, output_name)
+        tasks.append((img_path, output_path, filter_nfiq_score, crop_center, enhance, config))
+    
+    results = run_parallel(preprocess_fingerprint_scan, tasks, "Processing fingerprints", num_workers)
+    successful = sum(results)
+    total = len(files)
     
     logger.info(f"Processing complete: {successful}/{total} images processed successfully")
     return successful, total
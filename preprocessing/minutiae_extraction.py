@@ -6,10 +6,10 @@ import os
 import subprocess
 import numpy as np
 import logging
-from tqdm import tqdm
+from functools import lru_cache
 from typing import Optional, List, Tuple
 
-from .utils import get_file_name_and_ext
+from .utils import get_file_name_and_ext, iter_files, run_parallel
 from .config import get_default_config
 
 logger = logging.getLogger(__name__)
@@ -30,15 +30,21 @@ def call_mindtct(input_file: str, output_prefix: str, config=None) -> bool:
         config = get_default_config()
     
     try:
-        cmd = f'{config.MINDTCT_PATH} -m1 "{input_file}" "{output_prefix}"'
+        # Exec mindtct directly; no intermediate shell or argument quoting.
+        # Its output is only ever logged, so skip the pipes nobody would read.
+        capture_stdout = logger.isEnabledFor(logging.DEBUG)
+        capture_stderr = logger.isEnabledFor(logging.WARNING)
+        result = subprocess.run(
+            [config.MINDTCT_PATH, '-m1', input_file, output_prefix],
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+            check=False
+        )
         
-        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        process.wait()
-        
-        stdout, stderr = process.communicate()
-        
-        if stderr:
-            logger.warning(f"Mindtct warning for {input_file}: {stderr.decode('utf-8')}")
+        if result.stdout:
+            logger.debug(f"Mindtct output for {input_file}: {result.stdout.decode('utf-8', errors='replace')}")
+        if result.stderr:
+            logger.warning(f"Mindtct warning for {input_file}: {result.stderr.decode('utf-8', errors='replace')}")
         
         # Check if .min file was created (main output)
         min_file = f"{output_prefix}.min"
@@ -100,7 +106,8 @@ def extract_minutiae_from_folder(
     input_dir: str, 
     output_dir: str, 
     keep_all_files: bool = False,
-    config=None
+    config=None,
+    num_workers: Optional[int] = None
 ) -> Tuple[int, int]:
     """
     Extract minutiae from all images in a folder.
@@ -110,6 +117,7 @@ def extract_minutiae_from_folder(
         output_dir: Output directory for minutiae files
         keep_all_files: Whether to keep all output files or just .min
         config: Configuration object (optional)
+        num_workers: Number of concurrent mindtct runs (optional, defaults to config.NUM_WORKERS)
     
     Returns:
         Tuple of (successful_count, total_count)
@@ -117,20 +125,44 @@ def extract_minutiae_from_folder(
     if config is None:
         config = get_default_config()
     
+    if num_workers is None:
+        num_workers = config.NUM_WORKERS
+    
     successful = 0
     total = 0
     
     # Get all image files
-    image_files = []
-    for root, dirs, files in os.walk(input_dir):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in config.SUPPORTED_IMAGE_FORMATS):
-                image_files.append(os.path.join(root, file))
+    image_files = list(iter_files(input_dir, config.SUPPORTED_IMAGE_FORMATS))
     
-    for image_path in tqdm(image_files, desc="Extracting minutiae"):
+    # Each task just waits on its own mindtct process, so threads are enough to
+    # keep one mindtct running per core without a Python worker process per core.
+    # Unlike an asyncio loop, this also works when called from code that is
+    # already running one, such as a Jupyter notebook.
+    # mindtct outputs are named after the image stem alone, so images sharing a
+    # stem (a.jpg and a.png, or same-named files in different subfolders) would
+    # overwrite and clean up each other's outputs; only the first one is kept.
+    prefix_sources = {}
+    for image_path in image_files:
+        _, file_name, _ = get_file_name_and_ext(image_path)
+        if file_name in prefix_sources:
+            logger.error(f"Skipping {image_path}: minutiae for {file_name} already come from "
+                         f"{prefix_sources[file_name]}")
+        else:
+            prefix_sources[file_name] = image_path
+    unique_files = list(prefix_sources.values())
+    
+    tasks = [(image_path, output_dir, keep_all_files, config) for image_path in unique_files]
+    results = run_parallel(extract_minutiae_from_image, tasks, "Extracting minutiae", num_workers,
+                           use_threads=True)
+    min_files = dict(zip(unique_files, results))
+    
+    for image_path in image_files:
         total += 1
+        if image_path not in min_files:
+            # Never dispatched; already reported as skipped above
+            continue
+        min_file = min_files[image_path]
         
-        min_file = extract_minutiae_from_image(image_path, output_dir, keep_all_files, config)
         if min_file:
             successful += 1
         else:
@@ -139,7 +171,43 @@ def extract_minutiae_from_folder(
     logger.info(f"Minutiae extraction complete: {successful}/{total} images processed successfully")
     return successful, total
 
-def convert_min_to_txt(min_file_path: str, output_dir: str, quality_threshold: float = 0.0) -> Optional[str]:
+def _parse_min_records(records: List[tuple], min_file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert split .min fields to arrays in one pass.
+    
+    Args:
+        records: Tuples of (x, y, direction, quality, type, line) strings, where
+            line is the stripped source line, used in warnings
+        min_file_path: Source file, used in warnings
+    
+    Returns:
+        Tuple of (float array of x, y, direction, quality; array of type strings).
+        Records with non-numeric fields are dropped with a warning.
+    """
+    if not records:
+        return np.empty((0, 4)), np.array([], dtype=str)
+    
+    try:
+        values = np.array([record[:4] for record in records]).astype(np.float64)
+    except ValueError:
+        # Rare malformed lines; find and drop them individually
+        valid = []
+        for record in records:
+            try:
+                [float(field) for field in record[:4]]
+                valid.append(record)
+            except ValueError as e:
+                logger.warning(f"Error parsing line in {min_file_path}: {record[5]}, Error: {e}")
+        return _parse_min_records(valid, min_file_path)
+    
+    return values, np.array([record[4] for record in records])
+
+def convert_min_to_txt(
+    min_file_path: str,
+    output_dir: str,
+    quality_threshold: float = 0.0,
+    file_format: str = 'txt'
+) -> Optional[Tuple[str, int]]:
     """
     Convert NIST .min file to simplified text format.
     
@@ -147,66 +215,67 @@ def convert_min_to_txt(min_file_path: str, output_dir: str, quality_threshold: f
         min_file_path: Path to .min file
         output_dir: Output directory for .txt file
         quality_threshold: Minimum quality threshold for minutiae (0.0-1.0)
+        file_format: 'txt' for text lines, or 'npy' for a float32 (N, 4) array
+            with the same columns
     
     Returns:
-        Path to created .txt file or None if failed
+        Tuple of (path to created file, number of minutiae written) or None if failed
     """
     try:
-        with open(min_file_path, 'r') as min_file:
+        if file_format not in ('txt', 'npy'):
+            raise ValueError(f"unsupported minutiae file format: {file_format}")
+        
+        with open(min_file_path, 'r', buffering=1 << 16) as min_file:
             lines = min_file.readlines()
         
         # Extract filename
         file_name = os.path.splitext(os.path.basename(min_file_path))[0]
-        output_file_path = os.path.join(output_dir, f"{file_name}.txt")
+        output_file_path = os.path.join(output_dir, f"{file_name}.{file_format}")
         
         os.makedirs(output_dir, exist_ok=True)
         
-        minutiae_data = []
-        
-        # Parse minutiae data (skip first 3 header lines)
+        # Split minutiae lines (skip first 3 header lines) into their fields
+        # NIST format: ID:x,y:direction:quality:type:...
+        # (str.split beats a compiled regex here; re backtracks rather than
+        # running a DFA, and the fields need no validation beyond the float cast)
+        records = []
         for line in lines[3:]:
-            line = line.strip()
-            if not line:
+            fields = line.split(':')
+            if len(fields) < 5:
                 continue
             
-            try:
-                # Parse NIST format: ID:x,y:direction:type:quality:...
-                fields = line.split(':')
-                if len(fields) < 5:
-                    continue
-                
-                # Extract coordinates
-                x, y = map(int, fields[1].split(','))
-                
-                # Extract direction (in NIST units, convert to degrees)
-                direction_unit = int(fields[2])
-                orientation = (90 - (11.25 * direction_unit)) % 360
-                
-                # Extract quality
-                quality = float(fields[3])
-                
-                # Apply quality filter
-                if quality < quality_threshold:
-                    continue
-                
-                # Extract minutiae type
-                mn_type = fields[4].strip()
-                minutiae_type = 1 if 'BIF' in mn_type else 2  # 1=bifurcation, 2=termination
-                
-                minutiae_data.append(f"{minutiae_type} {x} {y} {orientation}")
-                
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Error parsing line in {min_file_path}: {line}, Error: {e}")
+            coords = fields[1].split(',')
+            if len(coords) != 2:
+                logger.warning(f"Error parsing line in {min_file_path}: {line.strip()}, Error: bad coordinates")
                 continue
+            
+            records.append((coords[0], coords[1], fields[2], fields[3], fields[4], line.strip()))
+        
+        values, mn_types = _parse_min_records(records, min_file_path)
+        
+        # Extract coordinates and direction (in NIST units, convert to degrees)
+        x = values[:, 0].astype(np.int64)
+        y = values[:, 1].astype(np.int64)
+        orientation = np.mod(90 - 11.25 * values[:, 2], 360)
+        
+        # Extract minutiae type: 1=bifurcation, 2=termination
+        minutiae_type = np.where(np.char.find(mn_types, 'BIF') >= 0, 1, 2)
+        
+        # Apply quality filter
+        keep = values[:, 3] >= quality_threshold
+        minutiae_data = np.column_stack([minutiae_type, x, y, orientation])[keep]
         
         # Write to file if we have sufficient minutiae
         if len(minutiae_data) > 0:
-            with open(output_file_path, 'w') as output_file:
-                for data in minutiae_data:
-                    output_file.write(f"{data}\\n")
+            if file_format == 'npy':
+                np.save(output_file_path, minutiae_data.astype(np.float32))
+            else:
+                # Format every row with one % operation and write it in one call
+                with open(output_file_path, 'w', buffering=1 << 16) as txt_file:
+                    txt_file.write(('%d %d %d %.6f\n' * len(minutiae_data)) % tuple(minutiae_data.ravel().tolist()))
             
             logger.debug(f"Converted {len(minutiae_data)} minutiae: {min_file_path} -> {output_file_path}")
-            return output_file_path
+            return output_file_path, len(minutiae_data)
         else:
             logger.warning(f"No valid minutiae found in {min_file_path}")
             return None
@@ -215,79 +284,123 @@ def convert_min_to_txt(min_file_path: str, output_dir: str, quality_threshold: f
         logger.error(f"Error converting {min_file_path} to txt: {e}")
         return None
 
+def _convert_and_check_minutiae_file(
+    min_file_path: str,
+    output_dir: str,
+    quality_threshold: float,
+    min_minutiae_count: int,
+    file_format: str = 'txt'
+) -> bool:
+    """
+    Convert one .min file and keep the result only if it has enough minutiae.
+    
+    Returns:
+        True if a file with at least min_minutiae_count minutiae was kept
+    """
+    result = convert_min_to_txt(min_file_path, output_dir, quality_threshold, file_format)
+    if result is None:
+        return False
+    
+    # Check if file has enough minutiae
+    txt_file, minutiae_count = result
+    if minutiae_count >= min_minutiae_count:
+        return True
+    
+    logger.warning(f"Removing file with insufficient minutiae ({minutiae_count}): {txt_file}")
+    try:
+        os.remove(txt_file)
+    except OSError as e:
+        logger.error(f"Error removing {txt_file}: {e}")
+    
+    return False
+
 def convert_all_minutiae_files(
     source_dir: str, 
     output_dir: str, 
     quality_threshold: float = 0.0,
-    min_minutiae_count: int = 5
+    min_minutiae_count: int = 5,
+    config=None,
+    num_workers: Optional[int] = None
 ) -> Tuple[int, int]:
     """
-    Convert all .min files in a directory to .txt format.
+    Convert all .min files in a directory to .txt (or .npy, see
+    config.MINUTIAE_FILE_FORMAT) format.
     
     Args:
         source_dir: Directory containing .min files
-        output_dir: Output directory for .txt files
+        output_dir: Output directory for converted files
         quality_threshold: Minimum quality threshold for minutiae
         min_minutiae_count: Minimum number of minutiae required
+        config: Configuration object (optional)
+        num_workers: Number of worker processes (optional, defaults to config.NUM_WORKERS)
     
     Returns:
         Tuple of (successful_count, total_count)
     """
-    os.makedirs(output_dir, exist_ok=True)
+    if config is None:
+        config = get_default_config()
     
-    successful = 0
-    total = 0
+    if num_workers is None:
+        num_workers = config.NUM_WORKERS
+    
+    os.makedirs(output_dir, exist_ok=True)
     
     # Find all .min files
-    min_files = []
-    for root, dirs, files in os.walk(source_dir):
-        for file in files:
-            if file.endswith('.min'):
-                min_files.append(os.path.join(root, file))
+    min_files = list(iter_files(source_dir, ('.min',)))
     
-    for min_file_path in tqdm(min_files, desc="Converting minutiae files"):
-        total += 1
-        
-        txt_file = convert_min_to_txt(min_file_path, output_dir, quality_threshold)
-        if txt_file:
-            # Check if file has enough minutiae
-            try:
-                with open(txt_file, 'r') as f:
-                    line_count = sum(1 for line in f if line.strip())
-                
-                if line_count >= min_minutiae_count:
-                    successful += 1
-                else:
-                    logger.warning(f"Removing file with insufficient minutiae ({line_count}): {txt_file}")
-                    os.remove(txt_file)
-            except Exception as e:
-                logger.error(f"Error checking minutiae count in {txt_file}: {e}")
+    tasks = [
+        (min_file_path, output_dir, quality_threshold, min_minutiae_count, config.MINUTIAE_FILE_FORMAT)
+        for min_file_path in min_files
+    ]
+    results = run_parallel(_convert_and_check_minutiae_file, tasks, "Converting minutiae files", num_workers)
+    successful = sum(results)
+    total = len(results)
     
     logger.info(f"Minutiae conversion complete: {successful}/{total} files converted successfully")
     return successful, total
 
+@lru_cache(maxsize=4096)
+def _parse_minutiae_cached(file_path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """
+    Parse a minutiae text file, memoized on its path and stat signature.
+    
+    The mtime and size arguments only key the cache, so an edited file is
+    parsed again. The returned array is read-only because it is shared
+    between callers.
+    """
+    # Load data: type, x, y, orientation_degrees
+    if file_path.endswith('.npy'):
+        data = np.load(file_path).astype(np.float64)
+    else:
+        with open(file_path, 'r', buffering=1 << 16) as f:
+            rows = [line.split() for line in f.read().splitlines() if line.strip()]
+        data = np.array(rows, dtype=np.float64)
+    if data.ndim != 2 or data.shape[1] < 4:
+        raise ValueError(f"expected 4 columns per line, got shape {data.shape}")
+    
+    # Convert orientation from degrees to radians
+    orientation = data[:, 3]
+    np.multiply(orientation, np.pi, out=orientation)
+    np.divide(orientation, 180, out=orientation)
+    
+    data.flags.writeable = False
+    return data
+
 def parse_minutiae_file(file_path: str) -> np.ndarray:
     """
     Parse minutiae text file into numpy array.
     
+    Results are cached per file until its modification time or size changes.
+    
     Args:
-        file_path: Path to minutiae .txt file
+        file_path: Path to minutiae .txt or .npy file
     
     Returns:
-        Numpy array with shape (N, 4) containing [type, x, y, orientation_radians]
+        Read-only numpy array with shape (N, 4) containing [type, x, y, orientation_radians]
     """
     try:
-        # Load data: type, x, y, orientation_degrees
-        data = np.loadtxt(file_path)
-        
-        # Ensure we have the right shape
-        if data.ndim == 1:
-            data = data.reshape(1, -1)
-        
-        # Convert orientation from degrees to radians
-        data[:, 3] = data[:, 3] * np.pi / 180
-        
-        return data
+        stat = os.stat(file_path)
+        return _parse_minutiae_cached(file_path, stat.st_mtime_ns, stat.st_size)
         
     except Exception as e:
         logger.error(f"Error parsing minutiae file {file_path}: {e}")
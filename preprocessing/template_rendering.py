@@ -3,19 +3,212 @@ Template rendering functions to convert minutiae data to visual representations.
 Creates RGB images from minutiae templates for use with Pix2Pix training.
 """
 import os
+import threading
+from functools import lru_cache
 import numpy as np
-import matplotlib.pyplot as plt
 import scipy.ndimage as ndimage
-from skimage.draw import line_nd, disk
-from tqdm import tqdm
+from PIL import Image
+from skimage.draw import disk
 from typing import Tuple, Optional
 import logging
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from .minutiae_extraction import parse_minutiae_file
 from .config import get_default_config
+from .utils import run_parallel
 
 logger = logging.getLogger(__name__)
 
+# Per-thread template buffers reused by folder runs, see _template_buffers
+_thread_buffers = threading.local()
+
+@lru_cache(maxsize=None)
+def _gaussian_kernel1d(sigma: float, truncate: float = 4.0) -> np.ndarray:
+    """
+    Normalized 1D Gaussian kernel, identical to the one used by ndimage.gaussian_filter.
+    
+    Kernels are cached per sigma and returned read-only.
+    
+    Args:
+        sigma: Standard deviation of the Gaussian
+        truncate: Kernel radius in standard deviations
+    
+    Returns:
+        Kernel weights of length 2 * radius + 1
+    """
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1)
+    phi = np.exp(-0.5 / (sigma * sigma) * x ** 2)
+    kernel = phi / phi.sum()
+    kernel.flags.writeable = False
+    return kernel
+
+@lru_cache(maxsize=None)
+def _gaussian_stamp2d(sigma: float) -> np.ndarray:
+    """Cached read-only 2D Gaussian stamp, the outer product of the 1D kernel."""
+    kernel = _gaussian_kernel1d(sigma)
+    stamp = np.outer(kernel, kernel)
+    stamp.flags.writeable = False
+    return stamp
+
+def _splat_stamp(
+    ys: np.ndarray,
+    xs: np.ndarray,
+    stamp: np.ndarray,
+    scale: float,
+    shape: Tuple[int, int]
+) -> np.ndarray:
+    """
+    NumPy counterpart of _splat_gaussian for a handful of points.
+    
+    Stamps are added into a canvas padded by the kernel radius, and the padding
+    is then folded back onto the image edges, which reproduces the 'reflect'
+    boundary mode of ndimage.gaussian_filter.
+    
+    Returns:
+        float32 array of the given shape
+    """
+    height, width = shape
+    size = stamp.shape[0]
+    radius = (size - 1) // 2
+    
+    padded = np.zeros((height + 2 * radius, width + 2 * radius))
+    for y, x in zip(ys, xs):
+        padded[y:y + size, x:x + size] += stamp
+    
+    # Fold the padding rows, then the padding columns, back onto the image
+    rows = padded[radius:radius + height]
+    rows[:radius] += padded[:radius][::-1]
+    rows[height - radius:] += padded[height + radius:][::-1]
+    blurred = rows[:, radius:radius + width]
+    blurred[:, :radius] += rows[:, :radius][:, ::-1]
+    blurred[:, width - radius:] += rows[:, width + radius:][:, ::-1]
+    
+    return (blurred * scale).astype(np.float32)
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _splat_gaussian(ys, xs, kernel, scale, out):
+        """
+        Add a scaled separable Gaussian stamp around each (y, x) point into out.
+        
+        Blurring a sparse map equals summing a kernel stamp at each of its non-zero
+        pixels. Stamp pixels falling outside the image are mirrored back in, which
+        reproduces the 'reflect' boundary mode of ndimage.gaussian_filter as long
+        as the kernel radius is smaller than the image.
+        """
+        height, width = out.shape
+        size = kernel.shape[0]
+        radius = (size - 1) // 2
+        
+        for n in range(ys.shape[0]):
+            y = ys[n]
+            x = xs[n]
+            for i in range(size):
+                yy = y + i - radius
+                if yy < 0:
+                    yy = -1 - yy
+                elif yy >= height:
+                    yy = 2 * height - 1 - yy
+                wy = scale * kernel[i]
+                for j in range(size):
+                    xx = x + j - radius
+                    if xx < 0:
+                        xx = -1 - xx
+                    elif xx >= width:
+                        xx = 2 * width - 1 - xx
+                    out[yy, xx] += wy * kernel[j]
+    
+    @numba.njit(cache=True)
+    def _rasterize_lines(y1, x1, y2, x2, out):
+        """
+        Draw a line from (y1, x1) to (y2, x2) for each minutia into out.
+        
+        Points are sampled like skimage.draw.line_nd with endpoint=True and
+        clipped to the image. fastmath is left off so the sample positions
+        round exactly as in the NumPy version.
+        """
+        height, width = out.shape
+        
+        for n in range(y1.shape[0]):
+            dy = y2[n] - y1[n]
+            dx = x2[n] - x1[n]
+            steps = max(abs(dy), abs(dx))
+            for k in range(steps + 1):
+                if k == steps:
+                    y = y2[n]
+                    x = x2[n]
+                else:
+                    y = int(np.rint(k * (dy / steps) + y1[n]))
+                    x = int(np.rint(k * (dx / steps) + x1[n]))
+                if 0 <= y < height and 0 <= x < width:
+                    out[y, x] = 255
+
+def _scale_minutiae(
+    minutiae: np.ndarray,
+    orig_size: Tuple[int, int],
+    target_size: Tuple[int, int],
+    line_length: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Project minutiae onto the target grid.
+    
+    Returns:
+        Tuple of (x, y, x_end, y_end) int64 arrays: the truncated scaled position
+        of each minutia and the end point of its orientation line
+    """
+    scale_y = target_size[0] / orig_size[0]
+    scale_x = target_size[1] / orig_size[1]
+    scaled_line_length = int(line_length * scale_x)
+    
+    # Scale coordinates
+    x_scaled = (minutiae[:, 1] * scale_x).astype(np.int64)
+    y_scaled = (minutiae[:, 2] * scale_y).astype(np.int64)
+    
+    # Calculate line endpoints
+    x2 = (x_scaled + scaled_line_length * np.cos(minutiae[:, 3])).astype(np.int64)
+    y2 = (y_scaled - scaled_line_length * np.sin(minutiae[:, 3])).astype(np.int64)  # Negative for image coordinates
+    
+    return x_scaled, y_scaled, x2, y2
+
+def _draw_minutiae(xs: np.ndarray, ys: np.ndarray, out: np.ndarray) -> None:
+    """Mark scaled minutiae positions in out, clipped to its edges."""
+    height, width = out.shape
+    out[ys.clip(0, height - 1), xs.clip(0, width - 1)] = 255
+
+def _draw_orientation_lines(
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    out: np.ndarray
+) -> None:
+    """Draw the orientation line of each scaled minutia into out."""
+    if NUMBA_AVAILABLE:
+        _rasterize_lines(y1, x1, y2, x2, out)
+        return
+    
+    # Rasterize all lines at once, sampling each like skimage.draw.line_nd with
+    # endpoint=True: steps + 1 evenly spaced points, rounded to the nearest pixel.
+    # Shorter lines repeat their end point to fill the shared sample axis.
+    steps = np.maximum(np.abs(y2 - y1), np.abs(x2 - x1))[:, None]
+    k = np.minimum(np.arange(steps.max() + 1)[None, :], steps)
+    divisor = np.maximum(steps, 1)
+    ys = np.where(k == steps, y2[:, None], k * ((y2 - y1)[:, None] / divisor) + y1[:, None])
+    xs = np.where(k == steps, x2[:, None], k * ((x2 - x1)[:, None] / divisor) + x1[:, None])
+    ys = np.round(ys).astype(np.int64)
+    xs = np.round(xs).astype(np.int64)
+    
+    # Filter coordinates within bounds
+    height, width = out.shape
+    valid_mask = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+    out[ys[valid_mask], xs[valid_mask]] = 255
+
 def create_minutiae_map(
     minutiae: np.ndarray, 
     orig_size: Tuple[int, int], 
@@ -32,20 +225,11 @@ def create_minutiae_map(
     Returns:
         Binary map with minutiae points marked
     """
-    if len(minutiae) == 0:
-        return np.zeros(target_size, dtype=np.uint8)
-    
-    scale_y = target_size[0] / orig_size[0]
-    scale_x = target_size[1] / orig_size[1]
-    
     minutiae_map = np.zeros(target_size, dtype=np.uint8)
     
-    # Scale and clip coordinates
-    x_coords = (minutiae[:, 1] * scale_x).astype(np.int32).clip(0, target_size[1] - 1)
-    y_coords = (minutiae[:, 2] * scale_y).astype(np.int32).clip(0, target_size[0] - 1)
-    
-    # Mark minutiae points
-    minutiae_map[y_coords, x_coords] = 255
+    if len(minutiae) > 0:
+        xs, ys, _, _ = _scale_minutiae(minutiae, orig_size, target_size, 0)
+        _draw_minutiae(xs, ys, minutiae_map)
     
     return minutiae_map
 
@@ -67,49 +251,118 @@ def create_orientation_map(
     Returns:
         Binary map with orientation lines
     """
-    if len(minutiae) == 0:
-        return np.zeros(target_size, dtype=np.uint8)
+    orientation_map = np.zeros(target_size, dtype=np.uint8)
     
-    scale_y = target_size[0] / orig_size[0]
-    scale_x = target_size[1] / orig_size[1]
-    scaled_line_length = int(line_length * scale_x)
+    if len(minutiae) > 0:
+        _draw_orientation_lines(*_scale_minutiae(minutiae, orig_size, target_size, line_length), orientation_map)
     
-    orientation_map = np.zeros(target_size, dtype=np.uint8)
+    return orientation_map
+
+def _gaussian_blur_into(image: np.ndarray, sigma: float, out: np.ndarray) -> np.ndarray:
+    """
+    Separable Gaussian blur over the last two axes of image, written into the
+    float32 buffer out.
+    
+    image may stay uint8: ndimage filters in double precision internally and
+    casts on output, so there is no need to promote the maps to float first.
+    
+    Equivalent to ndimage.gaussian_filter with sigma 0 on any leading axis, run
+    as two 1D passes that reuse out instead of allocating intermediate arrays.
+    Only the bounding box of the non-zero pixels, padded by the kernel radius,
+    is filtered: outside it the result is zero, and inside it the 'reflect'
+    boundary of the crop only mirrors zeros, so the values match filtering the
+    full image.
+    """
+    height, width = image.shape[-2:]
+    mask = image.reshape(-1, height, width).any(axis=0)
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    out.fill(0)
+    if len(rows) == 0:
+        return out
+    
+    pad = (len(_gaussian_kernel1d(sigma)) - 1) // 2 + 1
+    y0, y1 = max(rows[0] - pad, 0), min(rows[-1] + pad + 1, height)
+    x0, x1 = max(cols[0] - pad, 0), min(cols[-1] + pad + 1, width)
+    
+    crop = out[..., y0:y1, x0:x1]
+    ndimage.gaussian_filter1d(image[..., y0:y1, x0:x1], sigma, axis=-2, output=crop)
+    ndimage.gaussian_filter1d(crop, sigma, axis=-1, output=crop)
+    return out
+
+def _blur_channels(
+    minutiae_maps: np.ndarray,
+    orientation_maps: np.ndarray,
+    minutiae_sigma: float,
+    orientation_sigma: float,
+    config,
+    scratch: np.ndarray
+) -> np.ndarray:
+    """
+    Blur the minutiae and orientation maps of each channel and combine them.
     
-    for x, y, orientation in zip(minutiae[:, 1], minutiae[:, 2], minutiae[:, 3]):
-        # Scale coordinates
-        x_scaled = int(x * scale_x)
-        y_scaled = int(y * scale_y)
-        
-        # Calculate line endpoints
-        x2 = x_scaled + scaled_line_length * np.cos(orientation)
-        y2 = y_scaled - scaled_line_length * np.sin(orientation)  # Negative for image coordinates
+    Args:
+        minutiae_maps: Binary maps with minutiae points marked, shape (channels, height, width)
+        orientation_maps: Binary maps with orientation lines, same shape
+        minutiae_sigma: Gaussian sigma for the minutiae points
+        orientation_sigma: Gaussian sigma for the orientation lines
+        config: Configuration object
+        scratch: float32 buffer of shape (2, 3, height, width), overwritten
+    
+    Returns:
+        View of scratch holding the combined channels, clipped to [0, 255]
+    """
+    count, height, width = minutiae_maps.shape
+    minutiae_kernel = _gaussian_kernel1d(minutiae_sigma)
+    orientation_kernel = _gaussian_kernel1d(orientation_sigma)
+    max_radius = (max(len(minutiae_kernel), len(orientation_kernel)) - 1) // 2
+    stamps_fit = max_radius < min(height, width)
+    combined = scratch[0, :count]
+    minutiae_blurred = scratch[1, :count]
+    
+    if NUMBA_AVAILABLE and stamps_fit:
+        # Both maps are sparse, so stamping kernels at their set pixels is far
+        # cheaper than filtering the whole image. Stamps are summed in float64,
+        # the precision ndimage filters in, so rounding matches the filter path.
+        accumulator = np.empty((height, width))
+        for k in range(count):
+            accumulator.fill(0)
+            ys, xs = np.nonzero(minutiae_maps[k])
+            _splat_gaussian(ys, xs, minutiae_kernel, 255.0 * config.MINUTIAE_GAIN, accumulator)
+            ys, xs = np.nonzero(orientation_maps[k])
+            _splat_gaussian(ys, xs, orientation_kernel, 255.0 * config.ORIENTATION_GAIN, accumulator)
+            combined[k] = accumulator
+    else:
+        # Apply Gaussian blur, filtering all channels in one call. Without numba
+        # only the minutiae points, a few dozen pixels under the wide kernel,
+        # are cheap enough to stamp from Python.
+        if stamps_fit:
+            stamp = _gaussian_stamp2d(minutiae_sigma)
+            for k in range(count):
+                ys, xs = np.nonzero(minutiae_maps[k])
+                minutiae_blurred[k] = _splat_stamp(
+                    ys, xs, stamp, 255.0 * config.MINUTIAE_GAIN, (height, width)
+                )
+        else:
+            _gaussian_blur_into(minutiae_maps, minutiae_sigma, minutiae_blurred)
+            np.multiply(minutiae_blurred, config.MINUTIAE_GAIN, out=minutiae_blurred)
         
-        try:
-            # Draw line
-            line_coords = line_nd((y_scaled, x_scaled), (int(y2), int(x2)), endpoint=True)
-            
-            # Filter coordinates within bounds
-            valid_mask = (
-                (line_coords[0] >= 0) & (line_coords[0] < target_size[0]) &
-                (line_coords[1] >= 0) & (line_coords[1] < target_size[1])
-            )
-            
-            if valid_mask.any():
-                orientation_map[line_coords[0][valid_mask], line_coords[1][valid_mask]] = 255
-                
-        except Exception as e:
-            logger.debug(f"Error drawing orientation line: {e}")
-            continue
+        _gaussian_blur_into(orientation_maps, orientation_sigma, combined)
+        np.multiply(combined, config.ORIENTATION_GAIN, out=combined)
+        np.add(combined, minutiae_blurred, out=combined)
     
-    return orientation_map
+    # Combine and clip
+    np.clip(combined, 0, 255, out=combined)
+    return combined
 
 def create_template_image(
     minutiae: np.ndarray,
     orig_size: Tuple[int, int],
     target_size: Tuple[int, int] = (512, 512),
     include_singular: bool = False,
-    config=None
+    config=None,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Create RGB template image from minutiae data.
@@ -120,9 +373,11 @@ def create_template_image(
         target_size: Target output size (height, width)
         include_singular: Whether to include singular points (core/delta)
         config: Configuration object (optional)
+        out: Optional uint8 array of shape (height, width, 3) to render into
+        scratch: Optional float32 work buffer of shape (2, 3, height, width)
     
     Returns:
-        RGB image with shape (height, width, 3)
+        RGB image with shape (height, width, 3); out itself if it was given
     """
     if config is None:
         config = get_default_config()
@@ -142,63 +397,66 @@ def create_template_image(
             [-1]      # Blue: empty (placeholder)
         ]
     
-    channels = []
+    height, width = target_size
+    if out is None:
+        out = np.empty((height, width, 3), dtype=np.uint8)
+    if scratch is None:
+        scratch = np.empty((2, 3, height, width), dtype=np.float32)
+    
+    # Project all minutiae once, then draw each non-empty channel from its subset
+    xs, ys, x2, y2 = _scale_minutiae(minutiae, orig_size, target_size, config.ORIENTATION_LINE_LENGTH)
+    maps = np.zeros((2, len(type_channels), height, width), dtype=np.uint8)
+    drawn_channels = []
     
-    for channel_types in type_channels:
+    for c, channel_types in enumerate(type_channels):
+        # Empty channels stay black
+        out[:, :, c] = 0
         if channel_types == [-1]:
-            # Empty channel
-            channel = np.zeros(target_size, dtype=np.uint8)
-        else:
-            # Filter minutiae by type
-            type_mask = np.isin(minutiae[:, 0], channel_types)
-            filtered_minutiae = minutiae[type_mask]
-            
-            if len(filtered_minutiae) == 0:
-                channel = np.zeros(target_size, dtype=np.uint8)
-            else:
-                # Create minutiae and orientation maps
-                minutiae_map = create_minutiae_map(filtered_minutiae, orig_size, target_size)
-                orientation_map = create_orientation_map(
-                    filtered_minutiae, orig_size, target_size, config.ORIENTATION_LINE_LENGTH
-                )
-                
-                # Apply Gaussian blur
-                minutiae_blurred = ndimage.gaussian_filter(
-                    minutiae_map.astype(np.float32), 
-                    sigma=np.sqrt(config.MINUTIAE_SIGMA)
-                ) * config.MINUTIAE_GAIN
-                
-                orientation_blurred = ndimage.gaussian_filter(
-                    orientation_map.astype(np.float32),
-                    sigma=np.sqrt(config.ORIENTATION_SIGMA)
-                ) * config.ORIENTATION_GAIN
-                
-                # Combine and clip
-                channel = np.clip(minutiae_blurred + orientation_blurred, 0, 255).astype(np.uint8)
+            continue
         
-        channels.append(channel)
-    
-    # Stack channels to create RGB image
-    rgb_image = np.stack(channels, axis=2)
+        # Select minutiae by type
+        idx = np.flatnonzero(np.isin(minutiae[:, 0], channel_types))
+        
+        if len(idx) == 0:
+            continue
+        
+        k = len(drawn_channels)
+        drawn_channels.append(c)
+        _draw_minutiae(xs[idx], ys[idx], maps[0, k])
+        _draw_orientation_lines(xs[idx], ys[idx], x2[idx], y2[idx], maps[1, k])
+    
+    if drawn_channels:
+        count = len(drawn_channels)
+        combined = _blur_channels(
+            maps[0, :count], maps[1, :count],
+            np.sqrt(config.MINUTIAE_SIGMA), np.sqrt(config.ORIENTATION_SIGMA),
+            config, scratch
+        )
+        for k, c in enumerate(drawn_channels):
+            out[:, :, c] = combined[k]
     
-    return rgb_image
+    return out
 
 def create_template_from_file(
     minutiae_file: str,
     target_size: Tuple[int, int] = (512, 512),
     orig_size: Optional[Tuple[int, int]] = None,
     include_singular: bool = False,
-    config=None
+    config=None,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[np.ndarray] = None
 ) -> Optional[np.ndarray]:
     """
     Create template image from minutiae file.
     
     Args:
-        minutiae_file: Path to minutiae .txt file
+        minutiae_file: Path to minutiae .txt or .npy file
         target_size: Target output size (height, width)
         orig_size: Original fingerprint size, if None uses target_size
         include_singular: Whether to include singular points
         config: Configuration object (optional)
+        out: Optional output buffer, see create_template_image
+        scratch: Optional work buffer, see create_template_image
     
     Returns:
         RGB template image or None if failed
@@ -217,7 +475,7 @@ def create_template_from_file(
         
         # Create template image
         template_image = create_template_image(
-            minutiae, orig_size, target_size, include_singular, config
+            minutiae, orig_size, target_size, include_singular, config, out, scratch
         )
         
         return template_image
@@ -226,22 +484,70 @@ def create_template_from_file(
         logger.error(f"Error creating template from {minutiae_file}: {e}")
         return None
 
+def _template_buffers(target_size: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Output and scratch buffers for create_template_image, reused across the
+    templates rendered by the current thread as long as the size is unchanged.
+    """
+    shape = tuple(target_size)
+    buffers = getattr(_thread_buffers, 'buffers', None)
+    if buffers is None or buffers[0].shape[:2] != shape:
+        buffers = (
+            np.empty(shape + (3,), dtype=np.uint8),
+            np.empty((2, 3) + shape, dtype=np.float32)
+        )
+        _thread_buffers.buffers = buffers
+    return buffers
+
+def _create_and_save_template(
+    minutiae_file: str,
+    output_path: str,
+    target_size: Tuple[int, int],
+    include_singular: bool,
+    config
+) -> bool:
+    """
+    Create a template image from a minutiae file and save it.
+    
+    Returns:
+        True if the template was created and saved
+    """
+    out, scratch = _template_buffers(target_size)
+    template_image = create_template_from_file(
+        minutiae_file, target_size, None, include_singular, config, out, scratch
+    )
+    
+    if template_image is None:
+        logger.warning(f"Failed to create template for: {os.path.basename(minutiae_file)}")
+        return False
+    
+    # Save template image
+    try:
+        Image.fromarray(template_image, mode='RGB').save(output_path, format='PNG', compress_level=1)
+        logger.debug(f"Created template: {output_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving template {output_path}: {e}")
+        return False
+
 def create_templates_from_folder(
     minutiae_dir: str,
     output_dir: str,
     target_size: Tuple[int, int] = (512, 512),
     include_singular: bool = False,
-    config=None
+    config=None,
+    num_workers: Optional[int] = None
 ) -> Tuple[int, int]:
     """
     Create template images for all minutiae files in a folder.
     
     Args:
-        minutiae_dir: Directory containing minutiae .txt files
+        minutiae_dir: Directory containing minutiae .txt or .npy files
         output_dir: Output directory for template images
         target_size: Target output size (height, width)
         include_singular: Whether to include singular points
         config: Configuration object (optional)
+        num_workers: Number of worker processes (optional, defaults to config.NUM_WORKERS)
     
     Returns:
         Tuple of (successful_count, total_count)
@@ -249,35 +555,24 @@ def create_templates_from_folder(
     if config is None:
         config = get_default_config()
     
-    os.makedirs(output_dir, exist_ok=True)
+    if num_workers is None:
+        num_workers = config.NUM_WORKERS
     
-    successful = 0
-    total = 0
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Get all .txt files
-    txt_files = [f for f in os.listdir(minutiae_dir) if f.endswith('.txt')]
+    # Get all .txt and .npy minutiae files
+    minutiae_files = [f for f in os.listdir(minutiae_dir) if f.endswith(('.txt', '.npy'))]
     
-    for filename in tqdm(txt_files, desc="Creating template images"):
-        total += 1
-        
+    tasks = []
+    for filename in minutiae_files:
         minutiae_file = os.path.join(minutiae_dir, filename)
-        template_image = create_template_from_file(
-            minutiae_file, target_size, None, include_singular, config
-        )
-        
-        if template_image is not None:
-            # Save template image
-            output_filename = os.path.splitext(filename)[0] + '.png'
-            output_path = os.path.join(output_dir, output_filename)
-            
-            try:
-                plt.imsave(output_path, template_image)
-                successful += 1
-                logger.debug(f"Created template: {output_path}")
-            except Exception as e:
-                logger.error(f"Error saving template {output_path}: {e}")
-        else:
-            logger.warning(f"Failed to create template for: {filename}")
+        output_filename = os.path.splitext(filename)[0] + '.png'
+        output_path = os.path.join(output_dir, output_filename)
+        tasks.append((minutiae_file, output_path, target_size, include_singular, config))
+    
+    results = run_parallel(_create_and_save_template, tasks, "Creating template images", num_workers)
+    successful = sum(results)
+    total = len(results)
     
     logger.info(f"Template creation complete: {successful}/{total} templates created successfully")
     return successful, total
@@ -287,7 +582,7 @@ def visualize_template(minutiae_file: str, config=None) -> None:
     Visualize a minutiae template for debugging purposes.
     
     Args:
-        minutiae_file: Path to minutiae .txt file
+        minutiae_file: Path to minutiae .txt or .npy file
         config: Configuration object (optional)
     """
     if config is None:
@@ -296,6 +591,8 @@ def visualize_template(minutiae_file: str, config=None) -> None:
     template_image = create_template_from_file(minutiae_file, config=config)
     
     if template_image is not None:
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(8, 8))
         plt.imshow(template_image)
         plt.title(f"Template: {os.path.basename(minutiae_file)}")
@@ -3,9 +3,14 @@ Utility functions for fingerprint preprocessing.
 """
 import os
 import subprocess
+import multiprocessing
+import tempfile
 from PIL import Image, ImageFile
 from collections import Counter
-from typing import Optional, Dict, List
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+from typing import Callable, Iterable, Iterator, Optional, Dict, List
 import logging
 
 from .config import get_default_config
@@ -15,6 +20,10 @@ ImageFile.LOAD_TRUNCATED_IMAGES = True
 
 logger = logging.getLogger(__name__)
 
+# Worker pools shared by every run_parallel call, keyed by (use_threads, num_workers)
+_executors = {}
+_executors_lock = threading.Lock()
+
 def compute_nfiq_score(image_file: str, config=None) -> Optional[int]:
     """
     Compute NFIQ quality score for a fingerprint image.
@@ -59,15 +68,19 @@ def convert_image_to_png(image_file: str) -> Optional[str]:
     Returns:
         Path to converted PNG file or None if error
     """
+    output_file = None
     try:
         with Image.open(image_file) as image:
             # Convert to 8-bit grayscale
             if image.mode != 'L':
                 image = image.convert('L')
             
-            # Create output filename
-            file_name, _ = os.path.splitext(image_file)
-            output_file = f"{file_name}_8bit.png"
+            # Create a uniquely named output file next to the input, so inputs
+            # sharing a stem (a.jpg, a.png) converted at once do not collide
+            file_name, _ = os.path.splitext(os.path.basename(image_file))
+            fd, output_file = tempfile.mkstemp(suffix='.png', prefix=f"{file_name}_8bit_",
+                                               dir=os.path.dirname(image_file) or None)
+            os.close(fd)
             
             # Save as PNG
             image.save(output_file, 'PNG')
@@ -76,6 +89,9 @@ def convert_image_to_png(image_file: str) -> Optional[str]:
         
     except Exception as e:
         logger.error(f"Error converting {image_file} to PNG: {e}")
+        # Remove the partial temporary PNG so later runs do not take it for an input
+        if output_file is not None and os.path.exists(output_file):
+            os.remove(output_file)
         # Clean up original file if conversion failed
         if os.path.exists(image_file):
             os.remove(image_file)
@@ -98,29 +114,26 @@ def compute_nfiq_scores_batch(target_dir: str, config=None) -> Dict[int, int]:
     counter = Counter()
     processed = 0
     
-    for root, dirs, files in os.walk(target_dir):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in config.SUPPORTED_IMAGE_FORMATS):
-                processed += 1
-                
-                if processed % 100 == 0:
-                    logger.info(f"Processed {processed} images. Current distribution: {dict(counter)}")
-                
-                image_path = os.path.join(root, file)
-                
-                # Convert to PNG for NFIQ processing
-                converted_image = convert_image_to_png(image_path)
-                if converted_image is None:
-                    continue
-                
-                # Compute NFIQ score
-                nfiq_score = compute_nfiq_score(converted_image, config)
-                if nfiq_score is not None:
-                    counter[nfiq_score] += 1
-                
-                # Clean up temporary PNG
-                if os.path.exists(converted_image):
-                    os.remove(converted_image)
+    # Listed up front: the loop creates and removes temporary PNGs in target_dir
+    for image_path in list(iter_files(target_dir, config.SUPPORTED_IMAGE_FORMATS)):
+        processed += 1
+        
+        if processed % 100 == 0:
+            logger.info(f"Processed {processed} images. Current distribution: {dict(counter)}")
+        
+        # Convert to PNG for NFIQ processing
+        converted_image = convert_image_to_png(image_path)
+        if converted_image is None:
+            continue
+        
+        # Compute NFIQ score
+        nfiq_score = compute_nfiq_score(converted_image, config)
+        if nfiq_score is not None:
+            counter[nfiq_score] += 1
+        
+        # Clean up temporary PNG
+        if os.path.exists(converted_image):
+            os.remove(converted_image)
     
     logger.info(f"Final NFIQ distribution: {dict(counter)}")
     return counter
@@ -139,6 +152,46 @@ def get_file_name_and_ext(image_file: str) -> tuple:
     file_name, file_ext = os.path.splitext(full_file_name)
     return full_file_name, file_name, file_ext[1:] if file_ext else ""
 
+def iter_files(directory: str, extensions: Iterable[str]) -> Iterator[str]:
+    """
+    Recursively yield paths of files whose extension is in extensions.
+    
+    Uses os.scandir, so file types come from the directory entries without an
+    extra stat per file. Files are yielded in the same order as os.walk, and
+    symlinked directories are not followed. Directories that cannot be read
+    are skipped.
+    
+    Args:
+        directory: Root directory to search
+        extensions: File extensions to match, including the dot (case-insensitive)
+    
+    Yields:
+        Paths of matching files
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    
+    subdirs = []
+    with entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.lower().endswith(extensions):
+                yield entry.path
+    
+    for subdir in subdirs:
+        yield from iter_files(subdir, extensions)
+
 def list_image_files(folder: str, with_path: bool = True, config=None) -> List[str]:
     """
     List all image files in a folder (supports nested folders).
@@ -176,6 +229,65 @@ def list_image_files(folder: str, with_path: bool = True, config=None) -> List[s
     
     return image_files
 
+def _get_executor(use_threads: bool, num_workers: int):
+    """Return a persistent worker pool, created on first use and reused afterwards."""
+    key = (use_threads, num_workers)
+    with _executors_lock:
+        executor = _executors.get(key)
+        # A process pool whose worker died cannot accept new work
+        if executor is None or getattr(executor, '_broken', False):
+            executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+            executor = _executors[key] = executor_class(max_workers=num_workers)
+    return executor
+
+def _start_method() -> str:
+    """Start method process pools will use, without fixing it for the caller."""
+    method = multiprocessing.get_start_method(allow_none=True)
+    return method or multiprocessing.get_all_start_methods()[0]
+
+def run_parallel(
+    func: Callable,
+    tasks: List[tuple],
+    desc: str,
+    num_workers: Optional[int] = None,
+    use_threads: bool = False
+) -> list:
+    """
+    Run a per-file function over many inputs in a pool of workers.
+    
+    Pools are kept alive between calls, so repeated folder runs do not pay
+    the worker start-up cost again. A single task is run inline.
+    
+    Args:
+        func: Module-level (picklable) function to call
+        tasks: List of positional argument tuples, one per call
+        desc: Progress bar description
+        num_workers: Number of workers (None = all CPU cores, 1 = serial). With
+                     processes, None only uses all cores where the start method is
+                     'fork'; elsewhere it stays serial, since spawned workers
+                     re-import the calling script.
+        use_threads: Use threads instead of processes. Suited to work that mostly
+                     waits on external tools, which needs no extra Python
+                     interpreters or argument pickling.
+    
+    Returns:
+        List of results in the same order as tasks
+    """
+    if num_workers is None:
+        if use_threads or _start_method() == 'fork':
+            num_workers = os.cpu_count() or 1
+        else:
+            num_workers = 1
+    
+    if num_workers <= 1 or len(tasks) <= 1:
+        return [func(*args) for args in tqdm(tasks, desc=desc)]
+    
+    executor = _get_executor(use_threads, num_workers)
+    futures = [executor.submit(func, *args) for args in tasks]
+    for _ in tqdm(as_completed(futures), total=len(futures), desc=desc):
+        pass
+    return [future.result() for future in futures]
+
 def setup_logging(level=logging.INFO):
     """Setup logging configuration."""
     logging.basicConfig(